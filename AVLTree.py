@@ -2,6 +2,10 @@
 
 """A class representing a node in an AVL tree"""
 
+import math
+from collections import deque
+from fractions import Fraction
+
 class AVLNode(object):
 
 
@@ -15,6 +19,10 @@ class AVLNode(object):
 	def __init__(self, key, value):
 		self.key = key
 		self.value = value
+		self.sort_key = key
+		self.value_key = None
+		self.count = 1
+		self.max_end = None
 		self.left = None
 		self.right = None
 		self.parent = None
@@ -59,7 +67,7 @@ class AVLNode(object):
 
 	""" Calculates and returns the size of the subtree of a node
 	@rtype: int
-	@returns: size of the subtree of the node, including the node
+	@returns: size of the subtree of the node, including the node and its multiplicity
 	@post: node's size field not updated within this method
 	@complexity: O(1)
 	"""
@@ -68,7 +76,7 @@ class AVLNode(object):
 			return 0
 		left_size = self.left.size if self.left.is_real_node() else 0
 		right_size = self.right.size if self.right.is_real_node() else 0
-		return 1 + left_size + right_size
+		return self.count + left_size + right_size
 
 	""" Method that finds the successor of given node in tree
 	@param node: AVLNode to find successor of	
@@ -152,10 +160,37 @@ class AVLTree(object):
 	Constructor, you are allowed to add more fields.
 	@type root: AVLNode Object or None
 	@param root: Node to be root of AVLTree
+	@type key: function or None
+	@param key: function of one argument mapping a key to the value it is ordered by
+	(e.g. a tuple, a case-folded string or a negated number), identity if None
 	@complexity: O(1)
 	"""
-	def __init__(self):
+	def __init__(self, key=None):
 		self.root = AVLNode(None, None)
+		self.key_func = key
+
+	""" Computes the sort key by which a key is ordered in the tree
+	@type key: int
+	@param key: a key of the dictionary
+	@returns: key_func(key) if the tree has a key function, key otherwise
+	@complexity: O(1)
+	"""
+	def get_sort_key(self, key):
+		if self.key_func is None:
+			return key
+		return self.key_func(key)
+
+	""" Computes the key by which max_range compares values, stored on the node once on insertion
+	@type value: string
+	@param value: the value of an item
+	@returns: the lower-cased value, or value itself if it is not a string
+	@complexity: O(1)
+	"""
+	@staticmethod
+	def get_value_key(value):
+		if isinstance(value, str):
+			return value.lower()
+		return value
 
 
 	"""searches for a node in the dictionary corresponding to the key
@@ -167,14 +202,15 @@ class AVLTree(object):
 	@complexity: O(logn)
 	"""
 	def search(self, key):
+		sort_key = self.get_sort_key(key)
 		node = self.root
-		while node.key != key and node.is_real_node() :
-			if node.key > key:
+		while node.is_real_node():
+			if node.sort_key == sort_key:
+				return node
+			if node.sort_key > sort_key:
 				node = node.left
-			elif node.key < key:
+			else:
 				node = node.right
-		if node.key == key:
-			return node
 		return None
 
 	""" Inserts a new node into the dictionary with corresponding key and value
@@ -189,44 +225,76 @@ class AVLTree(object):
 	@complexity: O(logn)
 	"""
 	def insert(self, key, val):
+		return self._insert(key, val, False)[1]
+
+	""" Inserts key, or adds an occurrence of it if it already appears in the dictionary, in one descent
+	@type key: int
+	@param key: key of item that is to be inserted to self
+	@type val: string
+	@param val: the value of the item, ignored if key already appears
+	@rtype: tuple
+	@returns: (AVLNode holding key, the number of rebalancing operation due to AVL rebalancing)
+	@complexity: O(logn)
+	"""
+	def insert_occurrence(self, key, val):
+		return self._insert(key, val, True)
+
+	""" Inserts a new node, or adds an occurrence to the node of key if add_duplicates is set
+	@type add_duplicates: bool
+	@param add_duplicates: whether to stop the descent at a node with an equal key
+	@rtype: tuple
+	@returns: (AVLNode holding key, the number of rebalancing operation due to AVL rebalancing)
+	@complexity: O(logn)
+	"""
+	def _insert(self, key, val, add_duplicates):
 
 		num_of_operations = 0
+		sort_key = self.get_sort_key(key)
 		node_y, node_x = None, self.root
+		succ_node, pred_node = None, None  # last nodes the descent turned left / right at
 
 		while node_x.is_real_node():
 			node_y = node_x
-			if key < node_x.key:
+			if sort_key < node_x.sort_key:
+				succ_node = node_x
 				node_x = node_x.left
+			elif add_duplicates and sort_key == node_x.sort_key:
+				self.add_occurrence(node_x)
+				return node_x, num_of_operations
 			else:
+				pred_node = node_x
 				node_x = node_x.right
 
 		#  Arrived at a virtual node
 		if node_y is None:  # tree is empty
 			self.root.key = key
+			self.root.sort_key = sort_key
 			self.root.value = val
+			self.root.value_key = self.get_value_key(val)
 			self.root.height = 0
 			self.root.size = 1
 			self.root.add_virtual_sons()
-			return num_of_operations
+			return self.root, num_of_operations
 
 		else:
 			node_x.key = key
+			node_x.sort_key = sort_key
 			node_x.value = val
+			node_x.value_key = self.get_value_key(val)
 			node_x.height = 0
 			node_x.size = 1
 			node_x.add_virtual_sons()
 
-			node_x.successor_node = node_x.successor()
-			node_x.predecessor_node = node_x.predecessor()
-			if node_x.predecessor_node is not None:
-				node_x.predecessor_node.successor_node = node_x
-			if node_x.successor_node is not None:
-				node_x.successor_node.predecessor_node = node_x
-
+			node_x.successor_node = succ_node
+			node_x.predecessor_node = pred_node
+			if pred_node is not None:
+				pred_node.successor_node = node_x
+			if succ_node is not None:
+				succ_node.predecessor_node = node_x
 
 			num_of_operations = self._insertion_fix(node_x.parent)
 
-		return num_of_operations
+		return node_x, num_of_operations
 
 	""" Method that climbs to root and fixes  AVL Tree
 	@pre: new node already added to tree, called from insert method only
@@ -236,39 +304,38 @@ class AVLTree(object):
 	def _insertion_fix(self, node_y):
 		number_of_operations = 0
 		while node_y is not None:
+			left_height = node_y.left.height
+			right_height = node_y.right.height
 			original_y_height = node_y.height
-			node_y.height = node_y.check_height()
+			node_y.height = (left_height if left_height > right_height else right_height) + 1
 			node_y.size += 1
-			bf = node_y.calculate_balance_factor()
-			if abs(bf) < 2:
-				if original_y_height == node_y.height:
-					number_of_operations += self._update_up(node_y.parent)  # update sizes and heights up
+			bf = left_height - right_height
+			if -2 < bf < 2:
+				if original_y_height == node_y.height:  # heights above node_y do not change
+					self._add_to_sizes_up(node_y.parent, 1)
 					return number_of_operations
 				else:
 					node_y = node_y.parent
 					number_of_operations += 1
-			else:  # |bf| = 2
+			else:  # |bf| = 2, the rotation restores the height the subtree had before the insertion
 				number_of_operations += self.pick_rotation(node_y)
-				number_of_operations += self._update_up(node_y.parent.parent)
+				self._add_to_sizes_up(node_y.parent.parent, 1)
 				return number_of_operations
 		return number_of_operations
 
-	""" Method that climbs to root and fixes size and height of nodes 
-	@pre: validated that no rotations are needed from the param node up
-	@param node: AVLNode from which to update size and heights of nodes
-	@post: updated nodes' size and height fields
+	""" Method that climbs to root and adds delta to the size of nodes
+	@pre: heights from the param node up are already correct
+	@param node: AVLNode from which to update sizes, may be None
+	@type delta: int
+	@param delta: the change in the number of items below each node
+	@post: updated nodes' size fields
 	@complexity: O(logn)
 	"""
-	def _update_up(self, node):
-		cnt = 0
+	@staticmethod
+	def _add_to_sizes_up(node, delta):
 		while node is not None:
-			original_height = node.height
-			node.height = node.check_height()
-			if original_height != node.height:
-				cnt += 1
-			node.size = node.check_size()
+			node.size += delta
 			node = node.parent
-		return cnt
 
 	""" Deletes a node from the dictionary
 
@@ -279,12 +346,14 @@ class AVLTree(object):
 	@complexity: O(logn)
 	"""
 	def delete(self, node):
+		has_left = node.left.is_real_node()
+		has_right = node.right.is_real_node()
 
-		if (not (node.left.is_real_node())) and (not (node.right.is_real_node())):  # node is a leaf
+		if not has_left and not has_right:  # node is a leaf
 			ans = self.delete_leaf(node)
 			return ans
 
-		elif (not (node.left.is_real_node())) ^ (not (node.right.is_real_node())):  # node has one child
+		elif has_left ^ has_right:  # node has one child
 			ans = self.delete_node_with_one_child(node)
 
 		else:
@@ -301,29 +370,28 @@ class AVLTree(object):
 		@complexity: O(logn)
 		"""
 	def delete_leaf(self, node):
-		if self.root is node and self.size() == 1:
-			self.root = AVLNode(None, None)
+		if self.root is node:  # the root is the only node in the tree
+			self.root = node.left  # reuse a virtual son of the leaf as the empty root
+			self.root.parent = None
 			self.root.size = 0
 			self.root.height = 0
 			return 0
 		original_parent = node.parent
 		cnt = 0
-		if original_parent is not None:
+		if original_parent is not None:  # the virtual son of the leaf takes its place
 			if original_parent.left is node:
-				original_parent.left = AVLNode(None, None)
-				original_parent.left.parent = original_parent
+				original_parent.left = node.left
+				node.left.parent = original_parent
 			elif original_parent.right is node:
 				original_parent.successor_node = original_parent.right.successor_node
-				original_parent.right = AVLNode(None, None)
-				original_parent.right.parent = original_parent
+				original_parent.right = node.right
+				node.right.parent = original_parent
 
 			if node.predecessor_node is not None:
 				node.predecessor_node.successor_node = node.successor_node
 			if node.successor_node is not None:
 				node.successor_node.predecessor_node = node.predecessor_node
 
-			original_parent.size = original_parent.check_size()
-
 		cnt = self._deletion_fix(original_parent)
 		return cnt
 
@@ -358,7 +426,6 @@ class AVLTree(object):
 				node.predecessor_node.successor_node = node.successor_node
 			if node.successor_node is not None:
 				node.successor_node.predecessor_node = node.predecessor_node
-			original_parent.size = original_parent.check_size()
 		else:  # the node is the root with one child
 			if node.right.is_real_node():
 				node.successor_node.predecessor_node = node.predecessor_node
@@ -367,8 +434,7 @@ class AVLTree(object):
 			else:
 				node.predecessor_node.successor_node = node.successor_node
 				self.root = node.left
-		if original_parent is not None:
-			original_parent.size = original_parent.check_size()
+			self.root.parent = None
 		cnt = self._deletion_fix(original_parent)
 		return cnt
 
@@ -377,11 +443,11 @@ class AVLTree(object):
 		@type node: AVLNode
 		@pre: node is a real pointer to a node in self
 		@rtype: int
-		@returns: the number of rebalancing operation due to AVL rebalancing
+		@returns: the number of rebalancing operation due to AVL rebalancing above the position of node,
+		the rebalancing done while unlinking its successor is not counted
 		@complexity: O(logn)
 		"""
 	def delete_node_with_two_children(self, node):  # for node with 2 children, successor has no left child
-		original_parent = node.parent
 		cnt = 0
 		node_succ = node.successor_node
 		original_node_successor = node_succ.parent
@@ -414,9 +480,34 @@ class AVLTree(object):
 			else:
 				node_succ.parent.right = node_succ
 		node_succ.size = node_succ.check_size()
-		cnt = self._deletion_fix(original_parent)
+		node_succ.height = node_succ.check_height()
+		cnt = self._deletion_fix(node_succ.parent)  # node may have been rotated below its original parent
 		return cnt
 
+	""" Adds an occurrence of an existing key, for dictionaries holding duplicate keys
+	@type node: AVLNode
+	@pre: node is a real pointer to a node in self
+	@post: node.count and the sizes of node and its ancestors are increased by one
+	@complexity: O(logn)
+	"""
+	def add_occurrence(self, node):
+		node.count += 1
+		self._add_to_sizes_up(node, 1)
+
+	""" Removes one occurrence of a key, deleting its node if it was the last one
+	@type node: AVLNode
+	@pre: node is a real pointer to a node in self
+	@rtype: int
+	@returns: the number of rebalancing operation due to AVL rebalancing
+	@complexity: O(logn)
+	"""
+	def remove_occurrence(self, node):
+		if node.count == 1:
+			return self.delete(node)
+		node.count -= 1
+		self._add_to_sizes_up(node, -1)
+		return 0
+
 	""" Method that climbs to root and fixes AVL Tree after deletion
 	@pre: node already deleted from tree, called from delete method only
 	@param node: parent AVLNode of deleted node
@@ -434,18 +525,20 @@ class AVLTree(object):
 			return 0
 
 		while parent is not None:
+			left, right = parent.left, parent.right
 			original_parent_height = parent.height
-			parent.height = parent.check_height()
-			parent.size = parent.check_size()
+			parent.height = (left.height if left.height > right.height else right.height) + 1
+			parent.size = left.size + right.size + parent.count  # virtual sons have size 0
 			if original_parent_height != parent.height:  # counting height changes
 				cnt += 1
-			BF = parent.calculate_balance_factor()  # compute BF of parent
-			if abs(BF) < 2 and original_parent_height == parent.height:  # No rotation required
-				while parent is not None:
-					parent.size = parent.check_size()
+			BF = left.height - right.height  # compute BF of parent
+			if -2 < BF < 2 and original_parent_height == parent.height:  # No rotation required
+				parent = parent.parent
+				while parent is not None:  # only sizes change from here up
+					parent.size = parent.left.size + parent.right.size + parent.count
 					parent = parent.parent
 				return cnt
-			elif abs(BF) < 2 and original_parent_height != parent.height:  # height changed but BF is ok
+			elif -2 < BF < 2:  # height changed but BF is ok
 				parent = parent.parent  # go back to the while with the parent of the parent, until |BF|=2 found
 			else:  # |BF| = 2
 				new_parent = parent.parent
@@ -492,7 +585,7 @@ class AVLTree(object):
 	@pre: node is in self
 	@param node: a node in the dictionary to compute the rank for
 	@rtype: int
-	@returns: the rank of node in self
+	@returns: the rank of node in self, the rank of its first occurrence if node.count > 1
 	@complexity: O(logn)
 	"""
 	def rank(self, node):
@@ -502,7 +595,7 @@ class AVLTree(object):
 		node_to_check = node
 		while node_to_check is not None and node_to_check.parent is not None:
 			if node_to_check == node_to_check.parent.right:  # node_to_check is a right son
-				rank_sum = rank_sum + node_to_check.parent.left.size + 1
+				rank_sum = rank_sum + node_to_check.parent.left.size + node_to_check.parent.count
 			node_to_check = node_to_check.parent
 		return rank_sum
 
@@ -526,13 +619,13 @@ class AVLTree(object):
 	@complexity: O(logn)
 	"""
 	def select_rec(self, node, k):
-		r = node.left.size + 1
-		if k == r:
+		r = node.left.size
+		if r < k <= r + node.count:  # k falls on one of the occurrences of node
 			return node
-		elif k < r:
+		elif k <= r:
 			return self.select_rec(node.left, k)
 		else:
-			return self.select_rec(node.right, k-r)
+			return self.select_rec(node.right, k - r - node.count)
 
 	""" Finds node with largest value in a specified range of keys
 
@@ -546,20 +639,22 @@ class AVLTree(object):
 	@complexity: O(n)
 	"""
 	def max_range(self, a, b):
-		curr_node = self.search(a)  # search the relevant starting point O(logn)
-		max_node = curr_node
-		while curr_node.is_real_node() and curr_node.key <= b:  # search node with max value. O(n) (if a=min and b=max)
-			print(curr_node.key, curr_node.value)
-			if curr_node.value.lower() > max_node.value.lower():
-				max_node = curr_node
-
-			suc_node = curr_node.successor_node  # O(1)
-			curr_node = suc_node
-			if curr_node.successor_node is None:
-				break
+		a_key = self.get_sort_key(a)
+		b_key = self.get_sort_key(b)
+		curr_node = None
+		node = self.root
+		while node.is_real_node():  # search the relevant starting point, the first node with key >= a. O(logn)
+			if node.sort_key < a_key:
+				node = node.right
+			else:
+				curr_node = node
+				node = node.left
 
-		if max_node.value < curr_node.value:  # if key=b is the largest
-			max_node = curr_node
+		max_node = None
+		while curr_node is not None and curr_node.sort_key <= b_key:  # search node with max value. O(n) (if a=min and b=max)
+			if max_node is None or curr_node.value_key > max_node.value_key:
+				max_node = curr_node
+			curr_node = curr_node.successor_node  # O(1), None after the maximal node
 
 		return max_node
 
@@ -744,3 +839,232 @@ class AVLTree(object):
 			else:
 				self.left_rotation(AVL_criminal)
 				return 1
+
+
+"""
+A class implementing an interval tree over AVLTree.
+Keys are (start, end) tuples, ordered by start and then by end, and every node holds in
+max_end the maximal end point in its subtree.
+"""
+
+class IntervalAVLTree(AVLTree):
+
+	""" Recalculates the max_end field of a node from its own interval and its sons
+	@type node: AVLNode
+	@post: node's max_end field updated, nothing is done for a virtual node
+	@complexity: O(1)
+	"""
+	@staticmethod
+	def _refresh_max_end(node):
+		if not node.is_real_node():
+			return
+		max_end = node.key[1]
+		if node.left.is_real_node() and node.left.max_end > max_end:
+			max_end = node.left.max_end
+		if node.right.is_real_node() and node.right.max_end > max_end:
+			max_end = node.right.max_end
+		node.max_end = max_end
+
+	""" Method that fixes max_end of the sons of node and of every node from node up to the root
+	@param node: AVLNode from which to update, a son of it may be a newly placed node
+	@complexity: O(logn)
+	"""
+	def _update_max_end_up(self, node):
+		if not node.is_real_node():
+			return
+		self._refresh_max_end(node.left)
+		self._refresh_max_end(node.right)
+		while node is not None:
+			self._refresh_max_end(node)
+			node = node.parent
+
+	""" Inserts a new interval into the dictionary
+	@type key: tuple
+	@pre: key = (start, end) with start <= end, and key currently does not appear in the dictionary
+	@param key: the interval to be inserted to self
+	@param val: the value of the item
+	@rtype: int
+	@returns: the number of rebalancing operation due to AVL rebalancing
+	@complexity: O(logn)
+	"""
+	def insert(self, key, val):
+		cnt = AVLTree.insert(self, key, val)
+		if self.root.max_end is None:  # first interval, inserted without calling _insertion_fix
+			self._refresh_max_end(self.root)
+		return cnt
+
+	""" Fixes max_end on the path of the inserted node, then climbs to root and fixes AVL Tree
+	@pre: new node already added to tree, called from insert method only
+	@param node_y: parent AVLNode of inserted node
+	@complexity: O(logn)
+	"""
+	def _insertion_fix(self, node_y):
+		self._update_max_end_up(node_y)
+		return AVLTree._insertion_fix(self, node_y)
+
+	""" Fixes max_end on the path of the deleted node, then climbs to root and fixes AVL Tree
+	@pre: node already deleted from tree, called from delete method only
+	@param node: parent AVLNode of deleted node
+	@complexity: O(logn)
+	"""
+	def _deletion_fix(self, node):
+		self._update_max_end_up(node if node is not None else self.root)
+		return AVLTree._deletion_fix(self, node)
+
+	""" Rotates RR and fixes max_end of the rotated nodes
+	@type node: AVLNode
+	@param node: AVLNode where BF=2
+	@complexity: O(1)
+	"""
+	def right_rotation(self, node):
+		AVLTree.right_rotation(self, node)
+		self._refresh_max_end(node)
+		self._refresh_max_end(node.parent)
+
+	""" Rotates LL and fixes max_end of the rotated nodes
+	@type node: AVLNode
+	@param node: AVLNode where BF=2
+	@complexity: O(1)
+	"""
+	def left_rotation(self, node):
+		AVLTree.left_rotation(self, node)
+		self._refresh_max_end(node)
+		self._refresh_max_end(node.parent)
+
+	""" Rotates LR and fixes max_end of the rotated nodes
+	@type node: AVLNode
+	@param node: AVLNode where BF=2
+	@complexity: O(1)
+	"""
+	def left_then_right_rotation(self, node):
+		AVLTree.left_then_right_rotation(self, node)
+		new_root = node.parent
+		self._refresh_max_end(new_root.left)
+		self._refresh_max_end(new_root.right)
+		self._refresh_max_end(new_root)
+
+	""" Rotates RL and fixes max_end of the rotated nodes
+	@type node: AVLNode
+	@param node: AVLNode where BF=2
+	@complexity: O(1)
+	"""
+	def right_then_left_rotation(self, node):
+		AVLTree.right_then_left_rotation(self, node)
+		new_root = node.parent
+		self._refresh_max_end(new_root.left)
+		self._refresh_max_end(new_root.right)
+		self._refresh_max_end(new_root)
+
+	""" Lazily generates the intervals overlapping [s, e], in order of key
+	Subtrees whose max_end is smaller than s are skipped and the walk stops at the first
+	start larger than e.
+	@pre: s <= e, the tree is not modified while the generator is consumed
+	@rtype: generator of AVLNode
+	@returns: the nodes whose interval (start, end) has start <= e and end >= s
+	@complexity: O(min(n, (k+1)logn)) for k reported intervals
+	"""
+	def overlapping(self, s, e):
+		stack = []
+		node = self.root
+		while True:
+			if node.is_real_node() and node.max_end >= s:  # subtree may hold an overlapping interval
+				stack.append(node)
+				node = node.left
+			else:
+				if not stack:
+					return
+				node = stack.pop()
+				if node.key[0] > e:  # every following interval starts after e
+					return
+				if node.key[1] >= s:
+					yield node
+				node = node.right
+
+	""" Finds the intervals containing a point
+	@rtype: list
+	@returns: a list of the nodes whose interval (start, end) has start <= point <= end, in order of key
+	@complexity: O(min(n, (k+1)logn)) for k reported intervals
+	"""
+	def stab(self, point):
+		return list(self.overlapping(point, point))
+
+
+"""
+A class maintaining order statistics over a sliding window of the latest samples.
+"""
+
+class WindowedQuantiles(object):
+
+	"""
+	Constructor
+	@type window: int
+	@param window: the number of latest samples kept, older samples are evicted
+	@complexity: O(1)
+	"""
+	def __init__(self, window):
+		self.window = window
+		self.tree = AVLTree()  # every distinct sample is a node, node.count holds its multiplicity
+		self.samples = deque()  # nodes of the samples in order of arrival, oldest first, a node keeps its identity while it holds an occurrence
+
+	"""returns the number of samples in the window
+	@rtype: int
+	@complexity: O(1)
+	"""
+	def size(self):
+		return len(self.samples)
+
+	""" Adds a sample to the window, evicting the oldest sample if the window is full
+	@param x: the sample, comparable to the other samples and not None
+	@rtype: int
+	@returns: the number of rebalancing operation due to AVL rebalancing, of both the insertion and the eviction
+	@complexity: O(logn)
+	"""
+	def add(self, x):
+		node, cnt = self.tree.insert_occurrence(x, None)
+		self.samples.append(node)
+		if len(self.samples) > self.window:
+			cnt += self.tree.remove_occurrence(self.samples.popleft())
+		return cnt
+
+	""" Removes the oldest sample from the window
+	@pre: the window is not empty
+	@returns: the evicted sample, the rebalancing operations of its removal are not reported
+	@complexity: O(logn)
+	"""
+	def evict(self):
+		node = self.samples.popleft()
+		x = node.key
+		self.tree.remove_occurrence(node)
+		return x
+
+	""" Finds the q-quantile of the samples in the window, by the nearest-rank method
+	@type q: float
+	@pre: 0 <= q <= 1
+	@returns: the smallest sample x such that at least q of the samples are <= x
+	@raises ValueError: if the window is empty
+	@complexity: O(logn)
+	"""
+	def quantile(self, q):
+		if not self.samples:
+			raise ValueError("quantile of an empty window")
+		n = len(self.samples)
+		k = math.ceil(Fraction(str(q)) * n)  # exact, as the float product 0.07 * 100 is 7.000000000000001
+		return self.tree.select(min(n, max(1, k))).key
+
+	""" Computes the number of samples in the window which are smaller than or equal to x
+	@param x: a value comparable to the samples, not necessarily in the window
+	@rtype: int
+	@complexity: O(logn)
+	"""
+	def rank_of(self, x):
+		rank_sum = 0
+		node = self.tree.root
+		while node.is_real_node():
+			if x < node.sort_key:
+				node = node.left
+			else:
+				rank_sum += node.left.size + node.count
+				if x == node.sort_key:
+					break
+				node = node.right
+		return rank_sum
@@ -0,0 +1,52 @@
+"""Benchmark of IntervalAVLTree.overlapping against a linear scan.
+
+Builds a tree of random time ranges, then times window queries through overlapping()
+and through a scan of the list of intervals. Both must report the same intervals.
+Usage: python benchmarks/bench_interval_tree.py [--intervals N] [--queries Q] [--width W]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AVLTree import IntervalAVLTree
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--intervals", type=int, default=200000)
+	parser.add_argument("--queries", type=int, default=200)
+	parser.add_argument("--width", type=float, default=100.0)
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+
+	rng = random.Random(args.seed)
+	tree = IntervalAVLTree()
+	intervals = []
+	for _ in range(args.intervals):
+		start = rng.uniform(0, 1e6)
+		key = (start, start + rng.expovariate(1 / 50))
+		intervals.append(key)
+		tree.insert(key, None)
+	queries = [rng.uniform(0, 1e6) for _ in range(args.queries)]
+
+	start = time.perf_counter()
+	tree_hits = [len(list(tree.overlapping(s, s + args.width))) for s in queries]
+	tree_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	scan_hits = [sum(1 for a, b in intervals if a <= s + args.width and b >= s) for s in queries]
+	scan_time = time.perf_counter() - start
+
+	assert tree_hits == scan_hits
+	print("intervals=%d queries=%d avg hits=%.1f: overlapping %.1f us/query, linear scan %.1f us/query"
+		% (args.intervals, args.queries, sum(tree_hits) / len(queries),
+			1e6 * tree_time / len(queries), 1e6 * scan_time / len(queries)))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,64 @@
+"""Benchmark of WindowedQuantiles on 1M-sample streams.
+
+Reports the cost per sample of adding to the window and of reading p50/p95/p99 every
+`--every` samples. The baseline keeps the window in a deque and sorts it for every query.
+Usage: python benchmarks/bench_windowed_quantiles.py [--samples N] [--every K]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AVLTree import WindowedQuantiles
+
+QS = (0.5, 0.95, 0.99)
+
+
+def run_tree(data, window, every):
+	wq = WindowedQuantiles(window)
+	start = time.perf_counter()
+	for i, x in enumerate(data):
+		wq.add(x)
+		if i % every == 0:
+			for q in QS:
+				wq.quantile(q)
+	return time.perf_counter() - start
+
+
+def run_sorting(data, window, every):
+	recent = deque(maxlen=window)
+	start = time.perf_counter()
+	for i, x in enumerate(data):
+		recent.append(x)
+		if i % every == 0:
+			values = sorted(recent)
+			for q in QS:
+				values[max(1, math.ceil(q * len(values))) - 1]
+	return time.perf_counter() - start
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--samples", type=int, default=1000000)
+	parser.add_argument("--every", type=int, default=100)
+	parser.add_argument("--windows", type=int, nargs="+", default=[1000, 100000])
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+
+	rng = random.Random(args.seed)
+	data = [rng.lognormvariate(3, 1) for _ in range(args.samples)]  # latency-like stream
+	for window in args.windows:
+		tree_time = run_tree(data, window, args.every)
+		sort_time = run_sorting(data, window, args.every)
+		print("window=%d samples=%d every=%d: WindowedQuantiles %.2f us/sample, sort per query %.2f us/sample"
+			% (window, args.samples, args.every, 1e6 * tree_time / args.samples, 1e6 * sort_time / args.samples))
+
+
+if __name__ == "__main__":
+	main()
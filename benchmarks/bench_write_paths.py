@@ -0,0 +1,51 @@
+"""Micro-benchmark of the insert and delete paths of AVLTree against the frozen reference implementation.
+
+Inserts N random keys, then searches and deletes them in random order, reporting the time per operation.
+Usage: python benchmarks/bench_write_paths.py [--keys N] [--rounds R]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+import AVLTree as current
+import avl_tree_reference as reference
+
+
+def run(module, keys, order):
+	tree = module.AVLTree()
+	start = time.perf_counter()
+	for key in keys:
+		tree.insert(key, "v")
+	middle = time.perf_counter()
+	for key in order:
+		tree.delete(tree.search(key))
+	end = time.perf_counter()
+	return middle - start, end - middle
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--keys", type=int, default=200000)
+	parser.add_argument("--rounds", type=int, default=3)
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+
+	rng = random.Random(args.seed)
+	keys = rng.sample(range(10 * args.keys), args.keys)
+	order = keys[:]
+	rng.shuffle(order)
+	for name, module in (("reference", reference), ("current", current)):
+		best = [min(times) for times in zip(*(run(module, keys, order) for _ in range(args.rounds)))]
+		print("%-9s keys=%d: insert %.2f us/op, search+delete %.2f us/op"
+			% (name, args.keys, 1e6 * best[0] / args.keys, 1e6 * best[1] / args.keys))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,172 @@
+import random
+
+import pytest
+
+from AVLTree import AVLTree
+from tree_checks import check_tree
+
+
+""" Inserts and deletes random keys, checking the tree against a sorted list after every operation """
+def replay(tree, make_key, sort_key, seed, steps=300):
+	rng = random.Random(seed)
+	keys = {}
+	for _ in range(steps):
+		if keys and rng.random() < 0.45:
+			key = rng.choice(sorted(keys, key=sort_key))
+			del keys[key]
+			node = tree.search(key)
+			assert node is not None and node.key == key
+			tree.delete(node)
+			assert tree.search(key) is None
+		else:
+			key = make_key(rng)
+			if key in keys:
+				continue
+			keys[key] = str(key)
+			tree.insert(key, keys[key])
+		assert check_tree(tree) == sorted(keys, key=sort_key)
+		assert tree.size() == len(keys)
+	for key, value in keys.items():
+		assert tree.search(key).value == value
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_default_order(seed):
+	replay(AVLTree(), lambda rng: rng.randint(0, 400), lambda k: k, seed)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_descending_key(seed):
+	replay(AVLTree(key=lambda k: -k), lambda rng: rng.randint(0, 400), lambda k: -k, seed)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_case_folded_key(seed):
+	letters = "aAbBcC"
+
+	def make_key(rng):
+		return "".join(rng.choice(letters) for _ in range(rng.randint(1, 4)))
+
+	tree = AVLTree(key=str.lower)
+	rng = random.Random(seed)
+	folded = {}
+	for _ in range(200):  # keys equal after folding are the same key, keep one spelling each
+		key = make_key(rng)
+		if key.lower() in folded:
+			assert tree.search(key).key == folded[key.lower()]
+			continue
+		folded[key.lower()] = key
+		tree.insert(key, key)
+		assert check_tree(tree) == sorted(folded.values(), key=str.lower)
+	for spelling in list(folded.values()):
+		tree.delete(tree.search(spelling.swapcase()))
+		del folded[spelling.lower()]
+		assert check_tree(tree) == sorted(folded.values(), key=str.lower)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_tuple_key(seed):
+	order = lambda k: (k[1], -k[0])
+	replay(AVLTree(key=order), lambda rng: (rng.randint(0, 30), rng.randint(0, 30)), order, seed)
+
+
+def test_key_function_is_applied_once_per_insert():
+	calls = []
+
+	def key(k):
+		calls.append(k)
+		return -k
+
+	tree = AVLTree(key=key)
+	for k in range(100):
+		tree.insert(k, str(k))
+	assert len(calls) == 100
+	assert [k for k, _ in tree.avl_to_array()] == list(range(99, -1, -1))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_max_range(seed):
+	rng = random.Random(seed)
+	tree = AVLTree()
+	items = {}
+	for _ in range(rng.randint(1, 120)):
+		key = rng.randint(0, 300)
+		if key in items:
+			continue
+		items[key] = "".join(rng.choice("abcXYZ") for _ in range(3))
+		tree.insert(key, items[key])
+	keys = sorted(items)
+	for _ in range(50):
+		a = rng.choice(keys) if rng.random() < 0.5 else rng.randint(-10, 310)  # a need not be a key
+		b = a + rng.randint(0, 150)
+		in_range = [k for k in keys if a <= k <= b]
+		result = tree.max_range(a, b)
+		if not in_range:
+			assert result is None
+			continue
+		expected = max(in_range, key=lambda k: items[k].lower())  # first key holding the maximal value
+		assert result.key == expected
+
+
+def test_max_range_bounds_not_in_tree():
+	tree = AVLTree()
+	for k, v in ((1, "z"), (3, "b"), (5, "c")):
+		tree.insert(k, v)
+	assert tree.max_range(2, 5).key == 5
+	assert tree.max_range(0, 2).key == 1
+	assert tree.max_range(2, 2) is None
+	assert tree.max_range(6, 9) is None
+	assert AVLTree().max_range(0, 9) is None
+
+
+def test_max_range_stops_at_b(capsys):
+	tree = AVLTree()
+	for k in range(20):
+		tree.insert(k, "v%02d" % ((k * 7) % 20))
+	assert tree.max_range(3, 10).key == 8  # key 11 holds a larger value but lies past b
+	assert capsys.readouterr().out == ""
+
+
+def test_delete_root_with_one_child_clears_parent():
+	tree = AVLTree()
+	tree.insert(1, "a")
+	tree.insert(2, "b")
+	tree.delete(tree.search(1))
+	assert tree.root.key == 2 and tree.root.parent is None
+	assert tree.rank(tree.search(2)) == 1
+	check_tree(tree)
+
+
+def test_successor_takes_height_of_deleted_node():
+	tree = AVLTree()
+	for k in (4, 2, 6, 1, 3, 5, 7):
+		tree.insert(k, str(k))
+	tree.delete(tree.search(2))  # successor 3 is a leaf and replaces 2 above leaf 1
+	assert tree.search(3).height == 1
+	assert check_tree(tree) == [1, 3, 4, 5, 6, 7]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_delete_heavy_sequences(seed):
+	rng = random.Random(seed)
+	tree = AVLTree()
+	keys = rng.sample(range(1000), 200)
+	for key in keys:
+		tree.insert(key, str(key))
+	rng.shuffle(keys)
+	for i, key in enumerate(keys):  # mostly deletes of nodes with two children near the top
+		tree.delete(tree.search(key))
+		assert check_tree(tree) == sorted(keys[i + 1:])
+
+
+def test_insert_occurrence():
+	tree = AVLTree()
+	node, cnt = tree.insert_occurrence(5, "a")
+	assert node is tree.root and node.count == 1 and cnt == 0
+	for k in (3, 8, 3, 5, 5):
+		node, cnt = tree.insert_occurrence(k, str(k))
+		assert node.key == k and node is tree.search(k)
+	assert [tree.search(k).count for k in (3, 5, 8)] == [2, 3, 1]
+	assert tree.search(5).value == "a"
+	assert tree.size() == 6
+	check_tree(tree)
@@ -0,0 +1,93 @@
+"""Replays random operations on AVLTree.py and on the frozen reference implementation, which
+must return the same rebalancing counts and build the same trees"""
+
+import random
+
+import pytest
+
+import AVLTree as current
+import avl_tree_reference as reference
+
+
+""" Returns the shape of the subtree of node with every field the write paths maintain """
+def shape(node):
+	if not node.is_real_node():
+		return None
+	return (node.key, node.height, node.size, node.count, node.max_end, shape(node.left), shape(node.right))
+
+
+""" Returns the keys in order of the successor links and in reverse order of the predecessor links """
+def links(tree):
+	if not tree.root.is_real_node():
+		return [], []
+	first = tree.root.find_min_in_subtree(tree.root)
+	last = tree.root.find_max_in_subtree(tree.root)
+	forward, backward = [], []
+	node = first
+	while node is not None:
+		forward.append(node.key)
+		node = node.successor_node
+	node = last
+	while node is not None:
+		backward.append(node.key)
+		node = node.predecessor_node
+	return forward, backward[::-1]
+
+
+def assert_same(ref_tree, cur_tree):
+	assert shape(ref_tree.root) == shape(cur_tree.root)
+	assert links(ref_tree) == links(cur_tree)
+	assert cur_tree.root.parent is None
+
+
+@pytest.mark.parametrize("tree_class", ("AVLTree", "IntervalAVLTree"))
+@pytest.mark.parametrize("seed", range(100))
+def test_insert_delete_replay(tree_class, seed):
+	rng = random.Random(seed)
+	ref_tree = getattr(reference, tree_class)()
+	cur_tree = getattr(current, tree_class)()
+	span = rng.choice((30, 300, 3000))
+	keys = set()
+	for _ in range(300):
+		if keys and rng.random() < 0.45:
+			key = rng.choice(sorted(keys))
+			keys.discard(key)
+			ref_cnt = ref_tree.delete(ref_tree.search(key))
+			cur_cnt = cur_tree.delete(cur_tree.search(key))
+		else:
+			start = rng.randint(0, span)
+			key = (start, start + rng.randint(0, 50)) if tree_class == "IntervalAVLTree" else start
+			if key in keys:
+				continue
+			keys.add(key)
+			ref_cnt = ref_tree.insert(key, str(key))
+			cur_cnt = cur_tree.insert(key, str(key))
+		assert ref_cnt == cur_cnt
+		assert_same(ref_tree, cur_tree)
+	assert links(cur_tree)[0] == sorted(keys)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_occurrences_replay(seed):
+	rng = random.Random(seed)
+	window = rng.randint(1, 60)
+	trees = (reference.AVLTree(), current.AVLTree())
+	recent = []
+	for _ in range(500):  # the operations WindowedQuantiles makes on its tree
+		x = rng.randint(0, 40)
+		recent.append(x)
+		counts = []
+		for tree in trees:
+			node = tree.search(x)
+			if node is not None:
+				tree.add_occurrence(node)
+				cnt = 0
+			else:
+				cnt = tree.insert(x, None)
+			if len(recent) > window:
+				cnt += tree.remove_occurrence(tree.search(recent[0]))
+			counts.append(cnt)
+		if len(recent) > window:
+			recent.pop(0)
+		assert counts[0] == counts[1]
+		assert_same(*trees)
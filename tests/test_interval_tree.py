@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from AVLTree import IntervalAVLTree
+from tree_checks import check_tree
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_against_brute_force(seed):
+	rng = random.Random(seed)
+	tree = IntervalAVLTree()
+	intervals = set()
+	for _ in range(300):
+		if intervals and rng.random() < 0.4:
+			key = rng.choice(sorted(intervals))
+			intervals.discard(key)
+			tree.delete(tree.search(key))
+		else:
+			start = rng.randint(0, 200)
+			key = (start, start + rng.randint(0, 40))
+			if key in intervals:
+				continue
+			intervals.add(key)
+			tree.insert(key, None)
+		assert check_tree(tree) == sorted(intervals)  # also checks max_end of every node
+		s = rng.randint(-10, 250)
+		e = s + rng.randint(0, 30)
+		assert [n.key for n in tree.overlapping(s, e)] == sorted(k for k in intervals if k[0] <= e and k[1] >= s)
+		assert [n.key for n in tree.stab(s)] == sorted(k for k in intervals if k[0] <= s <= k[1])
+
+
+def test_shared_start_and_touching_ends():
+	tree = IntervalAVLTree()
+	for key in ((1, 3), (1, 10), (3, 4), (5, 5), (11, 12)):
+		tree.insert(key, None)
+	assert [n.key for n in tree.stab(3)] == [(1, 3), (1, 10), (3, 4)]
+	assert [n.key for n in tree.stab(5)] == [(1, 10), (5, 5)]
+	assert [n.key for n in tree.overlapping(10, 11)] == [(1, 10), (11, 12)]
+	assert tree.root.max_end == 12
+
+
+def test_overlapping_is_lazy():
+	tree = IntervalAVLTree()
+	for start in range(100):
+		tree.insert((start, start + 1000), None)
+	gen = tree.overlapping(0, 1000)
+	assert next(gen).key == (0, 1000)
+	assert next(gen).key == (1, 1001)
+
+
+def test_empty_tree():
+	tree = IntervalAVLTree()
+	assert list(tree.overlapping(0, 10)) == []
+	tree.insert((2, 4), None)
+	tree.delete(tree.search((2, 4)))
+	assert tree.stab(3) == []
@@ -0,0 +1,120 @@
+import bisect
+import random
+
+import pytest
+
+from AVLTree import AVLTree, WindowedQuantiles
+from tree_checks import check_tree, in_order
+
+
+PERCENTS = (0, 1, 7, 14, 25, 28, 50, 55, 56, 68, 95, 99, 100)
+
+
+""" Nearest-rank quantile of a sorted list, with the rank computed in integers as ceil(percent * n / 100) """
+def nearest_rank(values, percent):
+	k = -(-percent * len(values) // 100)
+	return values[max(1, k) - 1]
+
+
+@pytest.mark.parametrize("window", (1, 2, 7, 50))
+@pytest.mark.parametrize("seed", range(5))
+def test_against_sorted_window(window, seed):
+	rng = random.Random(seed)
+	wq = WindowedQuantiles(window)
+	recent = []
+	for _ in range(1500):
+		x = rng.randint(0, 25)  # few distinct values, so most samples are duplicates
+		wq.add(x)
+		recent = (recent + [x])[-window:]
+		expected = sorted(recent)
+		check_tree(wq.tree)
+		tree_nodes = set(map(id, in_order(wq.tree)))
+		assert [node.key for node in wq.samples] == recent
+		assert all(id(node) in tree_nodes for node in wq.samples)  # stored nodes survive rotations and deletions
+		assert wq.size() == wq.tree.size() == len(expected)
+		for percent in PERCENTS:
+			assert wq.quantile(percent / 100) == nearest_rank(expected, percent)
+		y = rng.randint(-1, 26)
+		assert wq.rank_of(y) == bisect.bisect_right(expected, y)
+
+
+@pytest.mark.parametrize("n", (25, 50, 75, 100))
+def test_quantile_rank_is_exact(n):
+	wq = WindowedQuantiles(n)
+	for x in range(1, n + 1):
+		wq.add(x)
+	for percent in range(101):  # 0.07 * 100 and 0.55 * 100 are not integers in floating point
+		assert wq.quantile(percent / 100) == nearest_rank(list(range(1, n + 1)), percent)
+	if n == 100:
+		assert wq.quantile(0.07) == 7 and wq.quantile(0.55) == 55
+
+
+def test_eviction_order():
+	wq = WindowedQuantiles(3)
+	for x in (5, 1, 5, 9):
+		wq.add(x)
+	assert [node.key for node in wq.samples] == [1, 5, 9]
+	assert wq.tree.search(5).count == 1
+	assert wq.evict() == 1
+	assert wq.tree.search(1) is None
+	assert wq.evict() == 5 and wq.evict() == 9
+	assert wq.size() == 0 and not wq.tree.root.is_real_node()
+
+
+def test_empty_window_quantile_raises():
+	wq = WindowedQuantiles(2)
+	with pytest.raises(ValueError):
+		wq.quantile(0.5)
+	wq.add(3)
+	wq.evict()
+	with pytest.raises(ValueError):
+		wq.quantile(0.5)
+	assert wq.rank_of(3) == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rank_and_select_with_counts(seed):
+	rng = random.Random(seed)
+	tree = AVLTree()
+	values = []
+	for _ in range(300):
+		x = rng.randint(0, 40)
+		node = tree.search(x)
+		if node is not None and rng.random() < 0.3:
+			values.remove(x)
+			tree.remove_occurrence(node)
+		else:
+			values.append(x)
+			if node is not None:
+				tree.add_occurrence(node)
+			else:
+				tree.insert(x, None)
+		values.sort()
+		check_tree(tree)
+		for x in set(values):
+			node = tree.search(x)
+			assert node.count == values.count(x)
+			assert tree.rank(node) == bisect.bisect_left(values, x) + 1
+		for i, x in enumerate(values, 1):
+			assert tree.select(i).key == x
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_add_counts_insertion_and_eviction(seed):
+	rng = random.Random(seed)
+	window = rng.randint(1, 20)
+	wq = WindowedQuantiles(window)
+	tree = AVLTree()  # replays the same occurrences by hand
+	recent = []
+	for _ in range(300):
+		x = rng.randint(0, 30)
+		recent.append(x)
+		node = tree.search(x)
+		if node is not None:
+			tree.add_occurrence(node)
+			expected = 0
+		else:
+			expected = tree.insert(x, None)
+		if len(recent) > window:
+			expected += tree.remove_occurrence(tree.search(recent.pop(0)))
+		assert wq.add(x) == expected
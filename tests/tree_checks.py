@@ -0,0 +1,53 @@
+"""Invariant checks shared by the tests"""
+
+
+""" Checks AVL balance, height, size and (if the node carries one) max_end of every node below node
+@rtype: tuple
+@returns: (height, size) of the subtree of node
+"""
+def check_subtree(node):
+	if not node.is_real_node():
+		return -1, 0
+	left_height, left_size = check_subtree(node.left)
+	right_height, right_size = check_subtree(node.right)
+	assert node.left.parent is node and node.right.parent is node, node.key
+	assert abs(left_height - right_height) < 2, node.key
+	assert node.height == max(left_height, right_height) + 1, node.key
+	assert node.size == left_size + right_size + node.count, node.key
+	if node.max_end is not None:
+		max_end = node.key[1]
+		for son in (node.left, node.right):
+			if son.is_real_node():
+				max_end = max(max_end, son.max_end)
+		assert node.max_end == max_end, node.key
+	return node.height, node.size
+
+
+""" Returns the real nodes of the tree in order, following left and right pointers """
+def in_order(tree):
+	nodes = []
+	stack = []
+	node = tree.root
+	while stack or node.is_real_node():
+		if node.is_real_node():
+			stack.append(node)
+			node = node.left
+		else:
+			node = stack.pop()
+			nodes.append(node)
+			node = node.right
+	return nodes
+
+
+""" Checks the tree invariants, the root's parent pointer and the successor / predecessor links
+@returns: the keys of the tree in order
+"""
+def check_tree(tree):
+	assert tree.root.parent is None
+	check_subtree(tree.root)
+	nodes = in_order(tree)
+	for prev, nxt in zip(nodes, nodes[1:]):
+		assert prev.successor_node is nxt and nxt.predecessor_node is prev
+	if nodes:
+		assert nodes[0].predecessor_node is None and nodes[-1].successor_node is None
+	return [node.key for node in nodes]